@@ -0,0 +1,161 @@
+"""Document-activity signals from the public t.me/s/ channel feed."""
+
+from __future__ import annotations
+
+import codecs
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from html.parser import HTMLParser
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_EXTENSIONS = ("pdf", "epub", "mobi")
+
+# Feed sayfası ~20 post içerir; bu sınırın üstü okunmaz
+MAX_FEED_BYTES = 2 * 1024 * 1024
+CHUNK_SIZE = 16 * 1024
+
+
+@dataclass
+class FeedActivity:
+    """Activity summary extracted from the most recent posts of a channel feed."""
+
+    posts_scanned: int = 0
+    documents: Dict[str, int] = field(default_factory=lambda: {ext: 0 for ext in DOCUMENT_EXTENSIONS})
+    last_post_at: Optional[str] = None
+    posts_per_day: float = 0.0
+
+    @property
+    def total_documents(self) -> int:
+        return sum(self.documents.values())
+
+
+def _classes(attrs: List[Tuple[str, Optional[str]]]) -> List[str]:
+    for name, value in attrs:
+        if name == "class" and value:
+            return value.split()
+    return []
+
+
+@dataclass
+class _PostRecord:
+    posted_at: Optional[datetime] = None
+    documents: Dict[str, int] = field(default_factory=lambda: {ext: 0 for ext in DOCUMENT_EXTENSIONS})
+
+
+class _FeedParser(HTMLParser):
+    """Incremental parser that only tracks the few feed elements we need.
+
+    No tree is built. The feed lists posts oldest first, so only a bounded
+    window of the last ``max_posts`` post records (time + document counts) is
+    kept; older records fall out as newer posts stream past.
+    """
+
+    def __init__(self, max_posts: int) -> None:
+        super().__init__(convert_charrefs=True)
+        self.window: deque[_PostRecord] = deque(maxlen=max(max_posts, 1))
+        self._in_date_link = False
+        self._doc_title: Optional[List[str]] = None
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag == "div":
+            classes = _classes(attrs)
+            if "tgme_widget_message" in classes and any(name == "data-post" for name, _ in attrs):
+                self.window.append(_PostRecord())
+            elif "tgme_widget_message_document_title" in classes and self.window:
+                self._doc_title = []
+        elif tag == "a" and "tgme_widget_message_date" in _classes(attrs):
+            self._in_date_link = True
+        elif tag == "time" and self._in_date_link and self.window:
+            value = dict(attrs).get("datetime")
+            if value:
+                try:
+                    self.window[-1].posted_at = datetime.fromisoformat(value)
+                except ValueError:
+                    pass
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "div" and self._doc_title is not None:
+            name = "".join(self._doc_title).strip().lower()
+            self._doc_title = None
+            ext = name.rsplit(".", 1)[-1] if "." in name else ""
+            if ext in DOCUMENT_EXTENSIONS:
+                self.window[-1].documents[ext] += 1
+        elif tag == "a":
+            self._in_date_link = False
+
+    def handle_data(self, data: str) -> None:
+        if self._doc_title is not None:
+            self._doc_title.append(data)
+
+
+def _summarise(parser: _FeedParser) -> FeedActivity:
+    posts = list(parser.window)
+    activity = FeedActivity(posts_scanned=len(posts))
+    for post in posts:
+        for ext, count in post.documents.items():
+            activity.documents[ext] += count
+
+    post_times = [post.posted_at for post in posts if post.posted_at is not None]
+    if post_times:
+        newest = max(post_times)
+        oldest = min(post_times)
+        activity.last_post_at = newest.isoformat()
+        span_days = (newest - oldest).total_seconds() / 86400
+        if len(post_times) >= 2 and span_days > 0:
+            activity.posts_per_day = round((len(post_times) - 1) / span_days, 3)
+    return activity
+
+
+def parse_feed_chunks(chunks: Iterable[bytes], max_posts: int = 20) -> FeedActivity:
+    """Parse an iterable of HTML byte chunks, summarising the last max_posts posts.
+
+    Parsing ends with the page (or when the caller stops yielding chunks, e.g.
+    at a byte cap); memory stays bounded by the post window.
+    """
+    parser = _FeedParser(max_posts)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    for chunk in chunks:
+        parser.feed(decoder.decode(chunk))
+    parser.feed(decoder.decode(b"", final=True))
+    parser.close()
+    return _summarise(parser)
+
+
+def fetch_feed_activity(handle: str, config: Config, max_posts: Optional[int] = None) -> Optional[FeedActivity]:
+    """Stream https://t.me/s/<handle> and summarise its recent document activity."""
+    url = f"https://t.me/s/{handle}"
+    headers = {"User-Agent": config.telegram_preview_user_agent}
+    limit = max_posts if max_posts is not None else config.feed_max_posts
+    try:
+        response = requests.get(url, headers=headers, timeout=config.request_timeout, stream=True)
+    except requests.RequestException as exc:
+        logger.warning("Telegram feed request failed for %s: %s", handle, exc)
+        return None
+
+    try:
+        if response.status_code != 200:
+            logger.info("Telegram feed returned %s for %s", response.status_code, handle)
+            return None
+
+        def bounded_chunks():
+            read = 0
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                read += len(chunk)
+                yield chunk
+                if read >= MAX_FEED_BYTES:
+                    return
+
+        return parse_feed_chunks(bounded_chunks(), max_posts=limit)
+    except requests.RequestException as exc:
+        logger.warning("Telegram feed read failed for %s: %s", handle, exc)
+        return None
+    finally:
+        response.close()
@@ -8,11 +8,20 @@ import logging
 import os
 from typing import List
 
-from .config import load_config
+from .channel_feed import fetch_feed_activity
+from .config import load_config, resolve_keyword_cache_dir, resolve_search_index_path
 from .google_search import discover_tme_links
+from .keyword_pack import ReloadingMatcher, load_matcher
 from .keywords import bootstrap_keywords
 from .scoring import total_score
-from .storage import classify_tme_url, save_candidates_to_csv
+from .search_index import (
+    CANDIDATE_POOL,
+    FULL_RANK_LIMIT,
+    index_candidates,
+    open_index,
+    search_channels,
+)
+from .storage import classify_tme_url, load_candidates_from_csv, save_candidates_to_csv
 from .telegram_preview import fetch_telegram_preview
 from .utils import extract_handle_from_url, now_filename, now_iso
 
@@ -37,20 +46,86 @@ def _build_parser() -> argparse.ArgumentParser:
         dest="queries",
         help="Override default queries (repeatable)",
     )
+    discover.add_argument(
+        "--keyword-pack",
+        type=str,
+        default=None,
+        help="JSON/YAML keyword pack (default: KEYWORD_PACK env or built-in lists)",
+    )
+    discover.add_argument(
+        "--feed-activity",
+        action="store_true",
+        help="Fetch t.me/s/<handle> feeds and score document activity",
+    )
+    discover.add_argument(
+        "--feed-max-posts",
+        type=int,
+        default=None,
+        help="Most recent posts to score per feed (default: FEED_MAX_POSTS env or 20)",
+    )
+    discover.add_argument(
+        "--no-index",
+        action="store_true",
+        help="Do not add results to the search index",
+    )
+    discover.add_argument("--index-path", type=str, default=None, help="Search index database path")
 
     bootstrap = subparsers.add_parser("bootstrap-keywords", help="Suggest new keywords")
     bootstrap.add_argument("--input", type=str, required=True, help="Input CSV path")
     bootstrap.add_argument("--top-n", type=int, default=50, help="Top N tokens")
     bootstrap.add_argument("--output", type=str, default=None, help="Optional output text file")
+    bootstrap.add_argument(
+        "--keyword-pack",
+        type=str,
+        default=None,
+        help="JSON/YAML keyword pack whose stopwords are used",
+    )
+
+    index = subparsers.add_parser("index", help="Add discovery CSVs to the search index")
+    index.add_argument(
+        "--input",
+        action="append",
+        dest="inputs",
+        required=True,
+        help="Input CSV path (repeatable)",
+    )
+    index.add_argument("--index-path", type=str, default=None, help="Search index database path")
+
+    search = subparsers.add_parser("search", help="Full-text search over indexed channels")
+    search.add_argument("query", type=str, help="Search terms")
+    search.add_argument("--limit", type=int, default=20, help="Maximum results")
+    search.add_argument("--min-score", type=int, default=0, help="Minimum score filter")
+    search.add_argument(
+        "--score-weight",
+        type=float,
+        default=1.0,
+        help=(
+            "How strongly the stored score influences ranking. When a query matches more"
+            f" than {FULL_RANK_LIMIT} channels, only the {CANDIDATE_POOL} highest-scored"
+            " matches are ranked; use 0 to rank every match by text relevance alone (slower)"
+        ),
+    )
+    search.add_argument("--index-path", type=str, default=None, help="Search index database path")
 
     return parser
 
 
+def _index_path(args: argparse.Namespace) -> str:
+    return resolve_search_index_path(args.index_path)
+
+
 def _run_discover(args: argparse.Namespace) -> int:
     config = load_config()
     queries = args.queries if args.queries else config.default_queries
     max_pages = args.max_pages if args.max_pages is not None else config.max_pages_per_query
 
+    pack_path = args.keyword_pack or config.keyword_pack_path
+    if pack_path:
+        # Uzun taramalarda pack dosyası değişirse yeniden yüklenir
+        matcher = ReloadingMatcher(pack_path, cache_dir=config.keyword_cache_dir)
+    else:
+        matcher = load_matcher(cache_dir=config.keyword_cache_dir)
+
     logger.info("Discovering t.me links with %d queries", len(queries))
     discoveries = discover_tme_links(queries, max_pages, config)
 
@@ -69,10 +144,23 @@ def _run_discover(args: argparse.Namespace) -> int:
         preview = fetch_telegram_preview(handle, config)
         title = preview.get("title", "") if preview else ""
         description = preview.get("description", "") if preview else ""
-        score = total_score(handle, title, description)
+        activity = None
+        if args.feed_activity and preview:
+            activity = fetch_feed_activity(handle, config, max_posts=args.feed_max_posts)
+        score = total_score(handle, title, description, matcher, activity)
         if score < args.min_score:
             continue
 
+        activity_fields = {}
+        if activity is not None:
+            activity_fields = {
+                "docs_pdf": str(activity.documents["pdf"]),
+                "docs_epub": str(activity.documents["epub"]),
+                "docs_mobi": str(activity.documents["mobi"]),
+                "last_post_at": activity.last_post_at or "",
+                "posts_per_day": str(activity.posts_per_day),
+            }
+
         original_url = result.get("url", "")
         rows.append(
             {
@@ -86,12 +174,22 @@ def _run_discover(args: argparse.Namespace) -> int:
                 "score": str(score),
                 "url_type": classify_tme_url(original_url),
                 "discovered_at": discovered_at,
+                **activity_fields,
             }
         )
 
     output_path = args.output or os.path.join("data", f"candidates_{now_filename()}.csv")
     save_candidates_to_csv(output_path, rows)
     logger.info("Saved %d candidates to %s", len(rows), output_path)
+
+    if not args.no_index:
+        index_path = _index_path(args)
+        conn = open_index(index_path)
+        try:
+            indexed = index_candidates(conn, rows)
+        finally:
+            conn.close()
+        logger.info("Indexed %d candidates in %s", indexed, index_path)
     print(output_path)
     return 0
 
@@ -108,7 +206,11 @@ def _run_bootstrap_keywords(args: argparse.Namespace) -> int:
                 }
             )
 
-    suggestions = bootstrap_keywords(channels, top_n=args.top_n)
+    stopwords = None
+    if args.keyword_pack:
+        stopwords = load_matcher(args.keyword_pack, cache_dir=resolve_keyword_cache_dir()).stopwords
+
+    suggestions = bootstrap_keywords(channels, top_n=args.top_n, stopwords=stopwords)
     lines = [f"{token}\t{count}" for token, count in suggestions]
 
     if args.output:
@@ -121,6 +223,41 @@ def _run_bootstrap_keywords(args: argparse.Namespace) -> int:
     return 0
 
 
+def _run_index(args: argparse.Namespace) -> int:
+    path = _index_path(args)
+    conn = open_index(path)
+    try:
+        for input_path in args.inputs:
+            indexed = index_candidates(conn, load_candidates_from_csv(input_path))
+            logger.info("Indexed %d candidates from %s", indexed, input_path)
+    finally:
+        conn.close()
+    return 0
+
+
+def _run_search(args: argparse.Namespace) -> int:
+    path = _index_path(args)
+    if not os.path.exists(path):
+        logger.error("Search index %s not found; run discover or index first", path)
+        return 1
+
+    conn = open_index(path)
+    try:
+        results = search_channels(
+            conn,
+            args.query,
+            limit=args.limit,
+            min_score=args.min_score,
+            score_weight=args.score_weight,
+        )
+    finally:
+        conn.close()
+
+    lines = [f"{row['score']}\t{row['handle']}\t{row['url']}\t{row['title']}" for row in results]
+    print("\n".join(lines))
+    return 0
+
+
 def main() -> int:
     logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
     parser = _build_parser()
@@ -130,6 +267,10 @@ def main() -> int:
         return _run_discover(args)
     if args.command == "bootstrap-keywords":
         return _run_bootstrap_keywords(args)
+    if args.command == "index":
+        return _run_index(args)
+    if args.command == "search":
+        return _run_search(args)
 
     parser.print_help()
     return 1
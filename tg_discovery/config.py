@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import os
-from typing import Iterable, List
+from typing import Iterable, List, Tuple
 
 from dotenv import load_dotenv
 
@@ -14,6 +14,11 @@ DEFAULT_UA = (
     "(KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
 )
 
+GOOGLE_CSE_ENDPOINT = "https://www.googleapis.com/customsearch/v1"
+
+DEFAULT_CACHE_DIR = os.path.join("data", ".cache")
+DEFAULT_SEARCH_INDEX_PATH = os.path.join("data", "channels.sqlite")
+
 # Türkçe kitap / ekitap / sınav kitapları odaklı default sorgular
 DEFAULT_QUERIES = [
     # Genel Türkçe kitap arşivleri
@@ -56,6 +61,15 @@ class Config:
     max_pages_per_query: int
     request_timeout: int
     telegram_preview_user_agent: str
+    keyword_pack_path: str | None = None
+    keyword_cache_dir: str = DEFAULT_CACHE_DIR
+    feed_max_posts: int = 20
+    search_index_path: str = DEFAULT_SEARCH_INDEX_PATH
+    google_credentials: List[Tuple[str, str]] = field(default_factory=list)
+    google_cse_endpoint: str = GOOGLE_CSE_ENDPOINT
+    cse_daily_quota: int = 100
+    cse_min_interval: float = 1.0
+    cse_quota_state_path: str | None = os.path.join(DEFAULT_CACHE_DIR, "cse_quota.json")
 
 
 def _parse_list_env(value: str | None, fallback: Iterable[str]) -> List[str]:
@@ -76,19 +90,68 @@ def _parse_int_env(value: str | None, fallback: int) -> int:
         return fallback
 
 
+def _parse_float_env(value: str | None, fallback: float) -> float:
+    """Parse a float env var with fallback on error."""
+    if not value:
+        return fallback
+    try:
+        return float(value)
+    except ValueError:
+        return fallback
+
+
+def _parse_credentials_env(value: str | None) -> List[Tuple[str, str]]:
+    """Parse "key:cx,key:cx" pairs into (api_key, cx) tuples."""
+    credentials: List[Tuple[str, str]] = []
+    for item in _parse_list_env(value, []):
+        api_key, sep, cse_cx = item.partition(":")
+        if not sep or not api_key.strip() or not cse_cx.strip():
+            raise ValueError(f"Invalid GOOGLE_CSE_CREDENTIALS entry (expected key:cx): {item!r}")
+        credentials.append((api_key.strip(), cse_cx.strip()))
+    return credentials
+
+
+def resolve_keyword_cache_dir() -> str:
+    """Return the keyword index cache directory from env/.env or the default."""
+    load_dotenv()
+    return os.getenv("KEYWORD_CACHE_DIR") or DEFAULT_CACHE_DIR
+
+
+def resolve_search_index_path(override: str | None = None) -> str:
+    """Return the search index path: explicit override, env/.env, or the default."""
+    if override:
+        return override
+    load_dotenv()
+    return os.getenv("SEARCH_INDEX_PATH") or DEFAULT_SEARCH_INDEX_PATH
+
+
 def load_config() -> Config:
     """Load config from environment variables and .env file."""
     load_dotenv()
 
     api_key = os.getenv("GOOGLE_API_KEY")
     cse_cx = os.getenv("GOOGLE_CSE_CX")
-    if not api_key or not cse_cx:
-        raise ValueError("Missing required env vars: GOOGLE_API_KEY, GOOGLE_CSE_CX")
+    credentials = _parse_credentials_env(os.getenv("GOOGLE_CSE_CREDENTIALS"))
+    if api_key and cse_cx and (api_key, cse_cx) not in credentials:
+        credentials.insert(0, (api_key, cse_cx))
+    if not credentials:
+        raise ValueError(
+            "Missing required env vars: GOOGLE_API_KEY, GOOGLE_CSE_CX (or GOOGLE_CSE_CREDENTIALS)"
+        )
+    api_key, cse_cx = credentials[0]
 
     default_queries = _parse_list_env(os.getenv("DEFAULT_QUERIES"), DEFAULT_QUERIES)
     max_pages = _parse_int_env(os.getenv("MAX_PAGES_PER_QUERY"), 3)
     request_timeout = _parse_int_env(os.getenv("REQUEST_TIMEOUT"), 10)
     ua = os.getenv("TELEGRAM_PREVIEW_USER_AGENT", DEFAULT_UA)
+    keyword_pack_path = os.getenv("KEYWORD_PACK") or None
+    keyword_cache_dir = resolve_keyword_cache_dir()
+    feed_max_posts = _parse_int_env(os.getenv("FEED_MAX_POSTS"), 20)
+    search_index_path = resolve_search_index_path()
+    endpoint = os.getenv("GOOGLE_CSE_ENDPOINT") or GOOGLE_CSE_ENDPOINT
+    daily_quota = _parse_int_env(os.getenv("CSE_DAILY_QUOTA"), 100)
+    min_interval = _parse_float_env(os.getenv("CSE_MIN_INTERVAL"), 1.0)
+    quota_state_path = os.getenv("CSE_QUOTA_STATE", os.path.join(DEFAULT_CACHE_DIR, "cse_quota.json"))
 
     return Config(
         google_api_key=api_key,
@@ -97,4 +160,13 @@ def load_config() -> Config:
         max_pages_per_query=max_pages,
         request_timeout=request_timeout,
         telegram_preview_user_agent=ua,
+        keyword_pack_path=keyword_pack_path,
+        keyword_cache_dir=keyword_cache_dir,
+        feed_max_posts=feed_max_posts,
+        search_index_path=search_index_path,
+        google_credentials=credentials,
+        google_cse_endpoint=endpoint,
+        cse_daily_quota=daily_quota,
+        cse_min_interval=min_interval,
+        cse_quota_state_path=quota_state_path or None,
     )
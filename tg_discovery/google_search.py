@@ -2,9 +2,17 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timezone
+import hashlib
+import json
 import logging
+import os
+import tempfile
+import threading
 import time
-from typing import Dict, List
+from typing import Dict, List, Optional, Set, Tuple
 
 import requests
 
@@ -12,48 +20,332 @@ from .config import Config
 
 logger = logging.getLogger(__name__)
 
+# Günlük kota bittiğini gösteren hata nedenleri; yalnızca bunlarda key gün boyu emekliye ayrılır
+DAILY_QUOTA_REASONS = {"dailyLimitExceeded", "dailyLimitExceededUnreg", "quotaExceeded"}
+# Dakikalık hız limiti; key beklenip tekrar denenir
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded", "RATE_LIMIT_EXCEEDED"}
 
-def search_google_cse(query: str, start: int, config: Config) -> Dict:
+RATE_LIMIT_BACKOFF = 2.0
+MAX_RATE_LIMIT_BACKOFF = 60.0
+MAX_RATE_LIMIT_RETRIES = 5
+
+
+def search_google_cse(
+    query: str,
+    start: int,
+    config: Config,
+    credential: Optional[Tuple[str, str]] = None,
+) -> Dict:
     """Call Google Custom Search API and return the JSON payload."""
-    endpoint = "https://www.googleapis.com/customsearch/v1"
+    api_key, cse_cx = credential or (config.google_api_key, config.google_cse_cx)
     params = {
-        "key": config.google_api_key,
-        "cx": config.google_cse_cx,
+        "key": api_key,
+        "cx": cse_cx,
         "q": query,
         "num": 10,
         "start": start,
     }
-    response = requests.get(endpoint, params=params, timeout=config.request_timeout)
+    response = requests.get(config.google_cse_endpoint, params=params, timeout=config.request_timeout)
     response.raise_for_status()
     return response.json()
 
 
-def discover_tme_links(queries: List[str], max_pages: int, config: Config) -> List[Dict[str, str]]:
-    """Discover t.me links using Google CSE across multiple queries and pages."""
-    results: List[Dict[str, str]] = []
-    for query in queries:
-        for page in range(max_pages):
-            start = 1 + page * 10
-            try:
-                payload = search_google_cse(query, start, config)
-            except requests.RequestException as exc:
-                logger.warning("Google CSE error for query '%s': %s", query, exc)
-                time.sleep(1.0)
+@dataclass
+class _CredentialState:
+    api_key: str
+    cse_cx: str
+    label: str
+    used: int = 0
+    exhausted: bool = False
+    disabled: bool = False
+    next_allowed: float = 0.0
+    backoff: float = 0.0
+
+    @property
+    def fingerprint(self) -> str:
+        # Anahtarın kendisi state dosyasına yazılmaz
+        return hashlib.sha256(f"{self.api_key}:{self.cse_cx}".encode("utf-8")).hexdigest()[:16]
+
+
+class CredentialPool:
+    """Thread-safe pool of (api_key, cx) pairs with per-credential quota and pacing.
+
+    Each credential is used at most once per ``min_interval`` seconds and at most
+    ``daily_quota`` times per UTC day. Usage is persisted to ``state_path`` so a
+    later run on the same day continues from the remaining quota; counts reset
+    when the UTC day changes, also in the middle of a run.
+    """
+
+    def __init__(
+        self,
+        credentials: List[Tuple[str, str]],
+        daily_quota: int,
+        min_interval: float,
+        state_path: Optional[str] = None,
+    ) -> None:
+        self.daily_quota = daily_quota
+        self.min_interval = min_interval
+        self.state_path = state_path
+        self._lock = threading.Lock()
+        self._credentials = [
+            _CredentialState(api_key, cse_cx, f"credential#{i + 1}")
+            for i, (api_key, cse_cx) in enumerate(credentials)
+        ]
+        self._day = self._today()
+        self._load_state()
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def __len__(self) -> int:
+        return len(self._credentials)
+
+    def _load_state(self) -> None:
+        if not self.state_path:
+            return
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as handle:
+                state = json.load(handle)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable CSE quota state %s: %s", self.state_path, exc)
+            return
+        used = state.get("used") if isinstance(state, dict) else None
+        if not isinstance(used, dict) or not all(
+            isinstance(count, int) and not isinstance(count, bool) for count in used.values()
+        ):
+            logger.warning("Ignoring malformed CSE quota state %s", self.state_path)
+            return
+        if state.get("date") != self._day:
+            return
+        for cred in self._credentials:
+            cred.used = max(used.get(cred.fingerprint, 0), 0)
+
+    def save_state(self) -> None:
+        """Persist today's per-credential usage counts."""
+        if not self.state_path:
+            return
+        with self._lock:
+            state = {
+                "date": self._day,
+                "used": {cred.fingerprint: cred.used for cred in self._credentials},
+            }
+        directory = os.path.dirname(self.state_path) or "."
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(state, handle)
+            os.replace(tmp_path, self.state_path)
+        except OSError as exc:
+            logger.warning("Could not write CSE quota state %s: %s", self.state_path, exc)
+
+    def acquire(self, exclude: Set[str]) -> Optional[_CredentialState]:
+        """Reserve one request on the soonest-available credential, waiting for its slot.
+
+        Returns None when every credential not in ``exclude`` is out of quota.
+        """
+        with self._lock:
+            self._roll_day()
+            candidates = [
+                cred
+                for cred in self._credentials
+                if cred.label not in exclude
+                and not cred.exhausted
+                and not cred.disabled
+                and cred.used < self.daily_quota
+            ]
+            if not candidates:
+                return None
+            cred = min(candidates, key=lambda c: c.next_allowed)
+            now = time.monotonic()
+            slot = max(now, cred.next_allowed)
+            cred.next_allowed = slot + self.min_interval
+            cred.used += 1
+
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return cred
+
+    def _roll_day(self) -> None:
+        # Çağıran kilidi tutar
+        today = self._today()
+        if today == self._day:
+            return
+        logger.info("UTC day changed, resetting CSE quota counters")
+        self._day = today
+        for cred in self._credentials:
+            cred.used = 0
+            cred.exhausted = False
+
+    def mark_exhausted(self, cred: _CredentialState) -> None:
+        """Take a credential out of rotation for the rest of the day."""
+        with self._lock:
+            cred.exhausted = True
+            cred.used = max(cred.used, self.daily_quota)
+
+    def disable(self, cred: _CredentialState) -> None:
+        """Stop using a credential for this run without touching its saved quota."""
+        with self._lock:
+            cred.disabled = True
+            cred.used = max(cred.used - 1, 0)
+
+    def back_off(self, cred: _CredentialState, retry_after: Optional[float] = None) -> float:
+        """Delay a rate-limited credential (exponential, or Retry-After) and refund the request."""
+        with self._lock:
+            cred.backoff = min(max(cred.backoff * 2, RATE_LIMIT_BACKOFF), MAX_RATE_LIMIT_BACKOFF)
+            delay = cred.backoff if retry_after is None else min(retry_after, MAX_RATE_LIMIT_BACKOFF)
+            cred.next_allowed = max(cred.next_allowed, time.monotonic() + delay)
+            cred.used = max(cred.used - 1, 0)
+            return delay
+
+    def mark_ok(self, cred: _CredentialState) -> None:
+        with self._lock:
+            cred.backoff = 0.0
+
+    def usage(self) -> Dict[str, int]:
+        with self._lock:
+            return {cred.label: cred.used for cred in self._credentials}
+
+
+def _classify_error(response: Optional[requests.Response]) -> str:
+    """Classify a CSE error response as "daily", "rate", "forbidden" or "other"."""
+    if response is None:
+        return "other"
+    reasons: Set[str] = set()
+    message = ""
+    try:
+        body = response.json()
+    except ValueError:
+        body = {}
+    error = body.get("error") if isinstance(body, dict) else None
+    if isinstance(error, dict):
+        message = str(error.get("message", ""))
+        for key in ("errors", "details"):
+            entries = error.get(key)
+            if not isinstance(entries, list):
                 continue
+            for entry in entries:
+                if isinstance(entry, dict) and entry.get("reason"):
+                    reasons.add(str(entry["reason"]))
 
-            for item in payload.get("items", []):
-                link = item.get("link", "")
-                if "t.me/" not in link:
+    # Google günlük kotayı bazen 429 + rateLimitExceeded ile ama "per day" mesajıyla bildirir
+    if reasons & DAILY_QUOTA_REASONS or "per day" in message.lower():
+        return "daily"
+    if response.status_code == 429 or reasons & RATE_LIMIT_REASONS:
+        return "rate"
+    if response.status_code == 403:
+        return "forbidden"
+    return "other"
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    try:
+        return float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+
+def _search_with_failover(
+    query: str,
+    start: int,
+    pool: CredentialPool,
+    config: Config,
+) -> Optional[Dict]:
+    """Run one CSE request, backing off on rate limits and failing over on exhausted keys."""
+    tried: Set[str] = set()
+    rate_limited = 0
+    while True:
+        cred = pool.acquire(tried)
+        if cred is None:
+            logger.warning("No CSE credential with remaining quota for query '%s' (start=%d)", query, start)
+            return None
+        try:
+            payload = search_google_cse(query, start, config, (cred.api_key, cred.cse_cx))
+        except requests.HTTPError as exc:
+            kind = _classify_error(exc.response)
+            if kind == "daily":
+                logger.warning("Google CSE daily quota exhausted on %s, failing over", cred.label)
+                pool.mark_exhausted(cred)
+                tried.add(cred.label)
+                continue
+            if kind == "rate":
+                # Reddedilen istek kotadan düşülmez; son denemede de key yavaşlatılır
+                delay = pool.back_off(cred, _retry_after(exc.response))
+                if rate_limited < MAX_RATE_LIMIT_RETRIES:
+                    rate_limited += 1
+                    logger.info("Google CSE rate limited on %s, backing off %.1fs", cred.label, delay)
                     continue
-                results.append(
-                    {
-                        "query": query,
-                        "google_title": item.get("title", ""),
-                        "google_snippet": item.get("snippet", ""),
-                        "url": link,
-                    }
+                logger.warning(
+                    "Google CSE still rate limited after %d retries for query '%s' (start=%d)",
+                    MAX_RATE_LIMIT_RETRIES,
+                    query,
+                    start,
                 )
+                return None
+            if kind == "forbidden":
+                logger.warning("Google CSE 403 on %s, disabling it for this run: %s", cred.label, exc)
+                pool.disable(cred)
+                tried.add(cred.label)
+                continue
+            logger.warning("Google CSE error for query '%s': %s", query, exc)
+            return None
+        except requests.RequestException as exc:
+            logger.warning("Google CSE error for query '%s': %s", query, exc)
+            return None
+        pool.mark_ok(cred)
+        return payload
 
-            time.sleep(1.0)
 
+def _extract_tme_items(query: str, payload: Dict) -> List[Dict[str, str]]:
+    results: List[Dict[str, str]] = []
+    for item in payload.get("items", []):
+        link = item.get("link", "")
+        if "t.me/" not in link:
+            continue
+        results.append(
+            {
+                "query": query,
+                "google_title": item.get("title", ""),
+                "google_snippet": item.get("snippet", ""),
+                "url": link,
+            }
+        )
     return results
+
+
+def discover_tme_links(queries: List[str], max_pages: int, config: Config) -> List[Dict[str, str]]:
+    """Discover t.me links using Google CSE across multiple queries and pages.
+
+    (query, page) requests are spread over all configured credentials in
+    parallel; results keep the query/page order.
+    """
+    credentials = config.google_credentials or [(config.google_api_key, config.google_cse_cx)]
+    pool = CredentialPool(
+        credentials,
+        daily_quota=config.cse_daily_quota,
+        min_interval=config.cse_min_interval,
+        state_path=config.cse_quota_state_path,
+    )
+    jobs = [(query, 1 + page * 10) for query in queries for page in range(max_pages)]
+    if not jobs:
+        return []
+
+    def run(job: Tuple[str, int]) -> List[Dict[str, str]]:
+        query, start = job
+        payload = _search_with_failover(query, start, pool, config)
+        if payload is None:
+            return []
+        return _extract_tme_items(query, payload)
+
+    try:
+        with ThreadPoolExecutor(max_workers=min(len(pool), len(jobs))) as executor:
+            pages = list(executor.map(run, jobs))
+    finally:
+        pool.save_state()
+
+    logger.info("Google CSE usage today: %s", pool.usage())
+    return [item for page in pages for item in page]
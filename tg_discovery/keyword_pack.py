@@ -0,0 +1,632 @@
+"""Keyword packs loaded from JSON/YAML and compiled into a cached matcher index."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+import hashlib
+import json
+import logging
+import os
+import struct
+import sys
+import tempfile
+import time
+from array import array
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from .keywords import (
+    CORE_BOOK_KEYWORDS,
+    EDU_KEYWORDS,
+    FORMAT_KEYWORDS,
+    HANDLE_KEYWORDS,
+    STOPWORDS,
+)
+
+logger = logging.getLogger(__name__)
+
+# Cache formatı değişirse eski dosyalar otomatik geçersiz olsun
+INDEX_FORMAT_VERSION = 4
+
+TARGETS = ("text", "handle")
+
+
+@dataclass(frozen=True)
+class KeywordCategory:
+    """A named group of keywords sharing one weight and match target."""
+
+    name: str
+    weight: int
+    target: str
+    keywords: List[str]
+
+
+@dataclass(frozen=True)
+class KeywordPack:
+    """Keyword categories plus stopwords for bootstrap cleanup."""
+
+    categories: List[KeywordCategory]
+    stopwords: FrozenSet[str] = field(default_factory=frozenset)
+
+
+def default_pack() -> KeywordPack:
+    """Build the built-in pack from the literals in keywords.py."""
+    return KeywordPack(
+        categories=[
+            KeywordCategory("core", 3, "text", list(CORE_BOOK_KEYWORDS)),
+            KeywordCategory("edu", 2, "text", list(EDU_KEYWORDS)),
+            KeywordCategory("format", 1, "text", list(FORMAT_KEYWORDS)),
+            KeywordCategory("handle", 2, "handle", list(HANDLE_KEYWORDS)),
+        ],
+        stopwords=frozenset(STOPWORDS),
+    )
+
+
+def _string_list(value, what: str) -> List[str]:
+    # Tek bir string verilirse harflerine bölünmesin; None da hata sayılır
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"{what} must be a list of strings")
+    words = [item.strip().lower() for item in value]
+    if any("\x00" in word for word in words):
+        raise ValueError(f"{what} must not contain NUL characters")
+    return [word for word in words if word]
+
+
+def pack_from_dict(data: Dict) -> KeywordPack:
+    """Validate a parsed pack document and convert it to a KeywordPack."""
+    raw_categories = data.get("categories")
+    if not isinstance(raw_categories, dict) or not raw_categories:
+        raise ValueError("Keyword pack needs a non-empty 'categories' mapping")
+
+    categories: List[KeywordCategory] = []
+    for name, spec in raw_categories.items():
+        if not isinstance(spec, dict):
+            raise ValueError(f"Keyword category '{name}' must be a mapping")
+        target = spec.get("target", "text")
+        if target not in TARGETS:
+            raise ValueError(f"Keyword category '{name}' has invalid target '{target}'")
+        try:
+            weight = int(spec.get("weight", 1))
+        except (TypeError, ValueError):
+            raise ValueError(f"Keyword category '{name}' has invalid weight") from None
+        keywords = _string_list(spec.get("keywords", []), f"Keywords of category '{name}'")
+        categories.append(KeywordCategory(str(name), weight, target, keywords))
+
+    stopwords = frozenset(_string_list(data.get("stopwords", []), "Keyword pack 'stopwords'"))
+    return KeywordPack(categories=categories, stopwords=stopwords)
+
+
+def pack_to_dict(pack: KeywordPack) -> Dict:
+    """Serialise a KeywordPack to the JSON/YAML document layout."""
+    return {
+        "categories": {
+            category.name: {
+                "weight": category.weight,
+                "target": category.target,
+                "keywords": list(category.keywords),
+            }
+            for category in pack.categories
+        },
+        "stopwords": sorted(pack.stopwords),
+    }
+
+
+def _parse_pack_bytes(raw: bytes, path: str) -> Dict:
+    """Parse pack file contents as YAML or JSON based on the extension."""
+    text = raw.decode("utf-8")
+    if path.endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("YAML keyword packs require PyYAML (pip install pyyaml)") from None
+        try:
+            data = yaml.safe_load(text)
+        except yaml.YAMLError as exc:
+            raise ValueError(f"Invalid YAML in keyword pack {path}: {exc}") from None
+    else:
+        data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError(f"Keyword pack {path} must contain a mapping at top level")
+    return data
+
+
+# -------------------------------------------------------------------
+# Aho-Corasick automaton — tüm keyword'ler tek geçişte aranır
+# -------------------------------------------------------------------
+
+class _Automaton:
+    """Multi-pattern substring matcher (Aho-Corasick) over a fixed keyword set.
+
+    The trie is built with per-state dicts and then flattened into parallel
+    arrays (CSR layout): state ``s`` owns edges ``edge_start[s]:edge_start[s+1]``
+    of ``edge_chars``/``edge_targets`` and outputs ``out_start[s]:out_start[s+1]``
+    of ``out_ids``. These arrays are what the cache stores, so loading is a few
+    ``frombytes`` calls instead of rebuilding millions of objects.
+    """
+
+    def __init__(self, patterns: List[str]) -> None:
+        goto: List[Dict[str, int]] = [{}]
+        fail: List[int] = [0]
+        outputs: List[Set[int]] = [set()]
+        for pattern_id, pattern in enumerate(patterns):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    fail.append(0)
+                    outputs.append(set())
+                state = nxt
+            outputs[state].add(pattern_id)
+
+        queue: deque[int] = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                fallback = fail[state]
+                while fallback and ch not in goto[fallback]:
+                    fallback = fail[fallback]
+                candidate = goto[fallback].get(ch, 0)
+                fail[nxt] = candidate if candidate != nxt else 0
+                outputs[nxt] |= outputs[fail[nxt]]
+
+        edge_start = array("i", [0])
+        edge_targets = array("i")
+        chars: List[str] = []
+        out_start = array("i", [0])
+        out_ids = array("i")
+        for edges, ids in zip(goto, outputs):
+            for ch in sorted(edges):
+                chars.append(ch)
+                edge_targets.append(edges[ch])
+            edge_start.append(len(edge_targets))
+            out_ids.extend(sorted(ids))
+            out_start.append(len(out_ids))
+
+        self.edge_start = edge_start
+        self.edge_chars = "".join(chars)
+        self.edge_targets = edge_targets
+        self.fail = array("i", fail)
+        self.out_start = out_start
+        self.out_ids = out_ids
+        self._reset_goto()
+
+    def _reset_goto(self) -> None:
+        # Eşleştirmede ziyaret edilen durumların kenarları dict'e açılır; yüklemede iş yok
+        self._goto: Dict[int, Dict[str, int]] = {}
+        self._hits: Dict[int, array] = {}
+
+    def _edges(self, state: int) -> Dict[str, int]:
+        lo = self.edge_start[state]
+        hi = self.edge_start[state + 1]
+        edges = dict(zip(self.edge_chars[lo:hi], self.edge_targets[lo:hi]))
+        self._goto[state] = edges
+        out_start = self.out_start
+        for target in edges.values():
+            if out_start[target] != out_start[target + 1]:
+                self._hits[target] = self.out_ids[out_start[target]:out_start[target + 1]]
+        return edges
+
+    def sections(self) -> Dict[str, object]:
+        return {
+            "edge_start": self.edge_start,
+            "edge_chars": self.edge_chars,
+            "edge_targets": self.edge_targets,
+            "fail": self.fail,
+            "out_start": self.out_start,
+            "out_ids": self.out_ids,
+        }
+
+    @classmethod
+    def from_sections(cls, data: Dict[str, object]) -> "_Automaton":
+        automaton = cls.__new__(cls)
+        automaton.edge_start = data["edge_start"]
+        automaton.edge_chars = data["edge_chars"]
+        automaton.edge_targets = data["edge_targets"]
+        automaton.fail = data["fail"]
+        automaton.out_start = data["out_start"]
+        automaton.out_ids = data["out_ids"]
+        automaton._validate()
+        automaton._reset_goto()
+        return automaton
+
+    def _validate(self) -> None:
+        states = len(self.fail)
+        if not (
+            states >= 1
+            and len(self.edge_start) == states + 1
+            and len(self.out_start) == states + 1
+            and len(self.edge_chars) == len(self.edge_targets) == self.edge_start[-1]
+            and len(self.out_ids) == self.out_start[-1]
+            and self.edge_start[0] == 0
+            and self.out_start[0] == 0
+        ):
+            raise ValueError("Automaton tables have inconsistent lengths")
+        for name in ("edge_targets", "fail"):
+            values = getattr(self, name)
+            if values and (min(values) < 0 or max(values) >= states):
+                raise ValueError(f"Automaton table '{name}' points outside the state range")
+        if self.out_ids and min(self.out_ids) < 0:
+            raise ValueError("Automaton output ids must be non-negative")
+
+    def find(self, text: str) -> Set[int]:
+        """Return the ids of all patterns occurring in text."""
+        goto = self._goto
+        hits = self._hits
+        fail = self.fail
+        found: Set[int] = set()
+        state = 0
+        for ch in text:
+            while True:
+                edges = goto.get(state)
+                if edges is None:
+                    edges = self._edges(state)
+                nxt = edges.get(ch)
+                if nxt is not None:
+                    state = nxt
+                    break
+                if not state:
+                    break
+                state = fail[state]
+            ids = hits.get(state)
+            if ids is not None:
+                found.update(ids)
+        return found
+
+
+class MatcherIndex:
+    """Compiled keyword pack: one automaton per target with per-pattern weights."""
+
+    def __init__(self, pack: KeywordPack) -> None:
+        self.stopwords = pack.stopwords
+        self.category_names = [category.name for category in pack.categories]
+        self._patterns: Dict[str, List[str]] = {}
+        self._weights: Dict[str, array] = {}
+        self._cat_start: Dict[str, array] = {}
+        self._cat_ids: Dict[str, array] = {}
+        self._automata: Dict[str, _Automaton] = {}
+
+        for target in TARGETS:
+            pattern_ids: Dict[str, int] = {}
+            weights: List[int] = []
+            categories: List[List[int]] = []
+            for cat_id, category in enumerate(pack.categories):
+                if category.target != target:
+                    continue
+                for kw in category.keywords:
+                    kw = kw.lower()
+                    if kw not in pattern_ids:
+                        pattern_ids[kw] = len(pattern_ids)
+                        weights.append(0)
+                        categories.append([])
+                    pid = pattern_ids[kw]
+                    # Aynı kelime listede iki kez geçerse eski davranıştaki gibi iki kez sayılır
+                    weights[pid] += category.weight
+                    categories[pid].append(cat_id)
+
+            patterns = list(pattern_ids)
+            cat_start = array("i", [0])
+            cat_ids = array("i")
+            for ids in categories:
+                cat_ids.extend(ids)
+                cat_start.append(len(cat_ids))
+            self._patterns[target] = patterns
+            self._weights[target] = array("q", weights)
+            self._cat_start[target] = cat_start
+            self._cat_ids[target] = cat_ids
+            self._automata[target] = _Automaton(patterns)
+
+    def to_bytes(self) -> bytes:
+        """Serialise the compiled tables into the binary cache format."""
+        sections: Dict[str, object] = {
+            "stopwords": _SEP.join(sorted(self.stopwords)),
+        }
+        for target in TARGETS:
+            sections[f"{target}.patterns"] = _SEP.join(self._patterns[target])
+            sections[f"{target}.weights"] = self._weights[target]
+            sections[f"{target}.cat_start"] = self._cat_start[target]
+            sections[f"{target}.cat_ids"] = self._cat_ids[target]
+            for name, value in self._automata[target].sections().items():
+                sections[f"{target}.{name}"] = value
+        return _pack_sections({"category_names": self.category_names}, sections)
+
+    @classmethod
+    def from_bytes(cls, blob: bytes) -> "MatcherIndex":
+        """Rebuild an index from to_bytes() output without recompiling."""
+        meta, sections = _unpack_sections(blob)
+        index = cls.__new__(cls)
+        names = meta.get("category_names")
+        if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+            raise ValueError("Cached index has invalid category names")
+        index.category_names = names
+        stopwords = sections["stopwords"]
+        index.stopwords = frozenset(stopwords.split(_SEP)) if stopwords else frozenset()
+        index._patterns = {}
+        index._weights = {}
+        index._cat_start = {}
+        index._cat_ids = {}
+        index._automata = {}
+        for target in TARGETS:
+            joined = sections[f"{target}.patterns"]
+            patterns = joined.split(_SEP) if joined else []
+            weights = sections[f"{target}.weights"]
+            cat_start = sections[f"{target}.cat_start"]
+            cat_ids = sections[f"{target}.cat_ids"]
+            automaton = _Automaton.from_sections(
+                {name: sections[f"{target}.{name}"] for name in _AUTOMATON_SECTIONS}
+            )
+            if not (
+                len(weights) == len(patterns)
+                and len(cat_start) == len(patterns) + 1
+                and len(cat_ids) == cat_start[-1]
+            ):
+                raise ValueError("Cached index pattern tables have inconsistent lengths")
+            if automaton.out_ids and max(automaton.out_ids) >= len(patterns):
+                raise ValueError("Cached index output ids exceed pattern count")
+            if cat_ids and (min(cat_ids) < 0 or max(cat_ids) >= len(names)):
+                raise ValueError("Cached index category ids out of range")
+            index._patterns[target] = patterns
+            index._weights[target] = weights
+            index._cat_start[target] = cat_start
+            index._cat_ids[target] = cat_ids
+            index._automata[target] = automaton
+        return index
+
+    def score(self, text: str, target: str = "text") -> int:
+        """Sum category weights of every distinct keyword found in text."""
+        weights = self._weights[target]
+        return sum(weights[pid] for pid in self._automata[target].find((text or "").lower()))
+
+    def matches(self, text: str, target: str = "text") -> Dict[str, List[str]]:
+        """Return matched keywords grouped by category name."""
+        grouped: Dict[str, List[str]] = {}
+        patterns = self._patterns[target]
+        cat_start = self._cat_start[target]
+        cat_ids = self._cat_ids[target]
+        for pid in sorted(self._automata[target].find((text or "").lower())):
+            for cat_id in cat_ids[cat_start[pid]:cat_start[pid + 1]]:
+                grouped.setdefault(self.category_names[cat_id], []).append(patterns[pid])
+        return grouped
+
+
+# -------------------------------------------------------------------
+# Binary cache layout: magic, header length, JSON header, raw sections.
+# Header lists each section's name, kind ("str" or an array typecode) and
+# byte length; arrays are stored little-endian.
+# -------------------------------------------------------------------
+
+_MAGIC = b"TGKI"
+_SEP = "\x00"
+_AUTOMATON_SECTIONS = ("edge_start", "edge_chars", "edge_targets", "fail", "out_start", "out_ids")
+
+
+def _pack_sections(meta: Dict, sections: Dict[str, object]) -> bytes:
+    layout = []
+    payload = []
+    for name, value in sections.items():
+        if isinstance(value, str):
+            raw = value.encode("utf-8")
+            kind = "str"
+        else:
+            if sys.byteorder != "little":
+                value = array(value.typecode, value)
+                value.byteswap()
+            raw = value.tobytes()
+            kind = value.typecode
+        layout.append([name, kind, len(raw)])
+        payload.append(raw)
+    header = json.dumps({"version": INDEX_FORMAT_VERSION, "meta": meta, "sections": layout}).encode("utf-8")
+    return b"".join([_MAGIC, struct.pack("<I", len(header)), header, *payload])
+
+
+def _unpack_sections(blob: bytes) -> Tuple[Dict, Dict[str, object]]:
+    if blob[:4] != _MAGIC or len(blob) < 8:
+        raise ValueError("Not a keyword index cache file")
+    (header_len,) = struct.unpack_from("<I", blob, 4)
+    offset = 8 + header_len
+    header = json.loads(blob[8:offset].decode("utf-8"))
+    if not isinstance(header, dict) or header.get("version") != INDEX_FORMAT_VERSION:
+        raise ValueError("Keyword index cache has a different format version")
+
+    view = memoryview(blob)
+    sections: Dict[str, object] = {}
+    for name, kind, size in header["sections"]:
+        if offset + size > len(blob):
+            raise ValueError("Keyword index cache is truncated")
+        chunk = view[offset:offset + size]
+        offset += size
+        if kind == "str":
+            sections[name] = str(chunk, "utf-8")
+            continue
+        if kind not in ("i", "q"):
+            raise ValueError(f"Unknown section kind {kind!r}")
+        values = array(kind)
+        values.frombytes(chunk)
+        if sys.byteorder != "little":
+            values.byteswap()
+        sections[name] = values
+    return header.get("meta", {}), sections
+
+
+# -------------------------------------------------------------------
+# Cache — içerik hash'ine göre ikili dosyada saklanan index tabloları
+# -------------------------------------------------------------------
+
+_CODE_DIGEST: Optional[str] = None
+
+
+def _code_digest() -> str:
+    """Hash of this module's source, so code changes invalidate old caches."""
+    global _CODE_DIGEST
+    if _CODE_DIGEST is None:
+        with open(__file__, "rb") as handle:
+            _CODE_DIGEST = hashlib.sha256(handle.read()).hexdigest()
+    return _CODE_DIGEST
+
+
+def _source_id(path: Optional[str]) -> str:
+    # Her pack dosyası kendi cache dosyasını tutar; varsayılan pack ile karışmaz
+    if not path:
+        return "default"
+    return hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()[:8]
+
+
+def _cache_path(cache_dir: str, source: str, digest: str) -> str:
+    return os.path.join(
+        cache_dir, f"keyword_index_v{INDEX_FORMAT_VERSION}_{source}_{digest[:16]}.bin"
+    )
+
+
+def _prune_cache(cache_dir: str, keep: str, source: str) -> None:
+    """Delete caches superseded by ``keep``: same source, old formats, legacy JSON."""
+    current = f"keyword_index_v{INDEX_FORMAT_VERSION}_"
+    try:
+        names = os.listdir(cache_dir)
+    except OSError:
+        return
+    for name in names:
+        if not name.startswith("keyword_index_v") or name == os.path.basename(keep):
+            continue
+        if name.startswith(current) and not name.startswith(f"{current}{source}_"):
+            continue
+        try:
+            os.remove(os.path.join(cache_dir, name))
+        except OSError as exc:
+            logger.debug("Could not remove stale keyword index cache %s: %s", name, exc)
+
+
+def _read_cached_index(path: str) -> Optional[MatcherIndex]:
+    try:
+        with open(path, "rb") as handle:
+            blob = handle.read()
+    except FileNotFoundError:
+        return None
+    except OSError as exc:
+        logger.warning("Ignoring unreadable keyword index cache %s: %s", path, exc)
+        return None
+    try:
+        return MatcherIndex.from_bytes(blob)
+    except (KeyError, TypeError, ValueError, struct.error) as exc:
+        logger.warning("Ignoring malformed keyword index cache %s: %s", path, exc)
+        return None
+
+
+def _write_cached_index(path: str, index: MatcherIndex) -> bool:
+    directory = os.path.dirname(path) or "."
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(index.to_bytes())
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        logger.warning("Could not write keyword index cache %s: %s", path, exc)
+        return False
+    return True
+
+
+def _index_for_bytes(
+    raw: bytes, parse, cache_dir: Optional[str], source: str
+) -> Tuple[MatcherIndex, str]:
+    """Return a compiled index for pack contents, using the cache when possible."""
+    digest = hashlib.sha256(raw).hexdigest()
+    if cache_dir:
+        key = hashlib.sha256(
+            f"{INDEX_FORMAT_VERSION}:{_code_digest()}:{digest}".encode("utf-8")
+        ).hexdigest()
+        path = _cache_path(cache_dir, source, key)
+        cached = _read_cached_index(path)
+        if cached is not None:
+            return cached, digest
+
+    index = MatcherIndex(parse())
+    if cache_dir and _write_cached_index(path, index):
+        _prune_cache(cache_dir, path, source)
+    return index, digest
+
+
+def load_matcher(path: Optional[str] = None, cache_dir: Optional[str] = None) -> MatcherIndex:
+    """Load a keyword pack file (or the built-in pack) as a compiled matcher."""
+    return _load_matcher_with_digest(path, cache_dir)[0]
+
+
+def _load_matcher_with_digest(
+    path: Optional[str], cache_dir: Optional[str]
+) -> Tuple[MatcherIndex, str]:
+    if not path:
+        pack = default_pack()
+        raw = json.dumps(pack_to_dict(pack), sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return _index_for_bytes(raw, lambda: pack, cache_dir, _source_id(None))
+
+    with open(path, "rb") as handle:
+        raw = handle.read()
+    return _index_for_bytes(
+        raw, lambda: pack_from_dict(_parse_pack_bytes(raw, path)), cache_dir, _source_id(path)
+    )
+
+
+_DEFAULT_MATCHER: Optional[MatcherIndex] = None
+
+
+def get_default_matcher() -> MatcherIndex:
+    """Return the process-wide matcher for the built-in pack."""
+    global _DEFAULT_MATCHER
+    if _DEFAULT_MATCHER is None:
+        _DEFAULT_MATCHER = load_matcher()
+    return _DEFAULT_MATCHER
+
+
+class ReloadingMatcher:
+    """Matcher that reloads its pack file when the file content changes.
+
+    The file is stat'ed at most once per ``check_interval`` seconds; a reload only
+    happens when the content hash differs, so touching the file is cheap. A broken
+    pack is logged and the previous index stays in use.
+    """
+
+    def __init__(self, path: str, cache_dir: Optional[str] = None, check_interval: float = 2.0) -> None:
+        self.path = path
+        self.cache_dir = cache_dir
+        self.check_interval = check_interval
+        self._index, self._digest = _load_matcher_with_digest(path, cache_dir)
+        self._mtime = self._stat_mtime()
+        self._checked_at = time.monotonic()
+
+    def _stat_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def current(self) -> MatcherIndex:
+        """Return the up-to-date compiled index, reloading if the pack changed."""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._index
+        self._checked_at = now
+
+        mtime = self._stat_mtime()
+        if mtime is None or mtime == self._mtime:
+            return self._index
+        self._mtime = mtime
+
+        try:
+            index, digest = _load_matcher_with_digest(self.path, self.cache_dir)
+        except (OSError, ValueError) as exc:
+            logger.warning("Keeping previous keyword pack, reload of %s failed: %s", self.path, exc)
+            return self._index
+
+        if digest != self._digest:
+            logger.info("Reloaded keyword pack %s", self.path)
+            self._index, self._digest = index, digest
+        return self._index
+
+    def score(self, text: str, target: str = "text") -> int:
+        return self.current().score(text, target)
+
+    @property
+    def stopwords(self) -> FrozenSet[str]:
+        return self.current().stopwords
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import re
 from collections import Counter
-from typing import Dict, Iterable, List, Tuple
+from typing import AbstractSet, Dict, Iterable, List, Optional, Tuple
 
 # -------------------------------------------------------------------
 # 1) TÜRKÇE KİTAP / EDEBİYAT / KÜLTÜR KELİMELERİ
@@ -151,11 +151,17 @@ def get_keyword_lists() -> Dict[str, List[str]]:
 # 7) BOOTSTRAP — otomatik yeni keyword keşfi
 # -------------------------------------------------------------------
 
-def bootstrap_keywords(channels: List[dict], top_n: int = 50) -> List[Tuple[str, int]]:
+def bootstrap_keywords(
+    channels: List[dict],
+    top_n: int = 50,
+    stopwords: Optional[AbstractSet[str]] = None,
+) -> List[Tuple[str, int]]:
     """
     Extract frequent tokens from channel metadata for keyword expansion.
     Used for improving future keyword lists based on real discovered data.
     """
+    if stopwords is None:
+        stopwords = STOPWORDS
     counter: Counter[str] = Counter()
 
     for channel in channels:
@@ -169,7 +175,7 @@ def bootstrap_keywords(channels: List[dict], top_n: int = 50) -> List[Tuple[str,
         for token in tokens:
             if len(token) < 3:
                 continue
-            if token in STOPWORDS:
+            if token in stopwords:
                 continue
             if token.isdigit():
                 continue
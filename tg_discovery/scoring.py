@@ -2,14 +2,13 @@
 
 from __future__ import annotations
 
-from typing import Dict, List
+from datetime import datetime, timezone
+from typing import Optional
 
-from .keywords import (
-    CORE_BOOK_KEYWORDS,
-    EDU_KEYWORDS,
-    FORMAT_KEYWORDS,
-    HANDLE_KEYWORDS,
-)
+from .channel_feed import FeedActivity
+from .keyword_pack import MatcherIndex, ReloadingMatcher, get_default_matcher
+
+Matcher = MatcherIndex | ReloadingMatcher
 
 # Türkçe dil sinyali
 TURKISH_CHARS = "ığüşöçİıĞÜŞÖÇ"
@@ -42,40 +41,55 @@ def is_probably_turkish(text: str) -> bool:
     return hits >= 2
 
 
-def score_text(title: str, description: str) -> int:
+def score_text(title: str, description: str, matcher: Optional[Matcher] = None) -> int:
     """Weighted scoring of text based on Turkish book-related keywords."""
-    text = f"{title or ''} {description or ''}".lower()
-    score = 0
+    matcher = matcher or get_default_matcher()
+    text = f"{title or ''} {description or ''}"
+    return matcher.score(text, "text")
 
-    # Kitap sinyali (en önemli)
-    for kw in CORE_BOOK_KEYWORDS:
-        if kw in text:
-            score += 3
 
-    # Eğitim sinyali
-    for kw in EDU_KEYWORDS:
-        if kw in text:
-            score += 2
+def score_handle(handle: str, matcher: Optional[Matcher] = None) -> int:
+    """Score channel handle based on keyword presence."""
+    matcher = matcher or get_default_matcher()
+    return matcher.score(handle or "", "handle")
 
-    # Format sinyalleri (pdf, epub)
-    for kw in FORMAT_KEYWORDS:
-        if kw in text:
-            score += 1
 
-    return score
+# Feed aktivite sinyalleri
+DOCUMENT_SCORE_CAP = 10
+INACTIVE_AFTER_DAYS = 180
+INACTIVE_PENALTY = 3
+ACTIVE_POSTS_PER_DAY = 1.0
 
 
-def score_handle(handle: str) -> int:
-    """Score channel handle based on keyword presence."""
-    h = (handle or "").lower()
-    score = 0
-    for kw in HANDLE_KEYWORDS:
-        if kw in h:
-            score += 2
+def score_activity(activity: Optional[FeedActivity], now: Optional[datetime] = None) -> int:
+    """Score feed activity: reward document posts, penalise stale channels."""
+    if activity is None or activity.posts_scanned == 0:
+        return 0
+
+    # Her pdf/epub/mobi eki bir puan, üst sınırlı
+    score = min(activity.total_documents, DOCUMENT_SCORE_CAP)
+
+    if activity.posts_per_day >= ACTIVE_POSTS_PER_DAY:
+        score += 1
+
+    if activity.last_post_at:
+        now = now or datetime.now(timezone.utc)
+        last = datetime.fromisoformat(activity.last_post_at)
+        if last.tzinfo is None:
+            last = last.replace(tzinfo=timezone.utc)
+        if (now - last).days > INACTIVE_AFTER_DAYS:
+            score -= INACTIVE_PENALTY
+
     return score
 
 
-def total_score(handle: str, title: str, description: str) -> int:
+def total_score(
+    handle: str,
+    title: str,
+    description: str,
+    matcher: Optional[Matcher] = None,
+    activity: Optional[FeedActivity] = None,
+) -> int:
     """Calculate final channel score with Turkish detection."""
     combined_text = f"{title or ''} {description or ''}"
 
@@ -83,6 +97,7 @@ def total_score(handle: str, title: str, description: str) -> int:
     if not is_probably_turkish(combined_text):
         return 0
 
-    base = score_text(title, description) + score_handle(handle)
+    base = score_text(title, description, matcher) + score_handle(handle, matcher)
+    base += score_activity(activity)
 
-    return base
+    return max(base, 0)
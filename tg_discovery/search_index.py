@@ -0,0 +1,269 @@
+"""Persistent full-text search index over discovered channels (SQLite FTS5)."""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sqlite3
+from typing import Dict, Iterable, List, Set
+
+from .config import DEFAULT_SEARCH_INDEX_PATH
+from .utils import fold_turkish
+
+logger = logging.getLogger(__name__)
+
+TEXT_FIELDS = ["handle", "title", "description", "google_title", "google_snippet"]
+
+# bm25 sütun ağırlıkları, TEXT_FIELDS sırasıyla
+BM25_WEIGHTS = (2.0, 3.0, 1.0, 1.5, 1.0)
+
+# Normalizasyon / FTS düzeni değişince FTS tablosu channels'tan yeniden kurulur
+SCHEMA_VERSION = 3
+
+# FTS rowid = (score << 32) | channel id; yüksek skorlu eşleşmeler rowid DESC ile önce gelir
+_ID_BITS = 32
+_ID_MASK = (1 << _ID_BITS) - 1
+_MAX_SCORE_KEY = (1 << 30) - 1
+
+# Bu kadar eşleşmeye kadar tüm sonuçlar bm25 ile tam sıralanır; üstünde en yüksek
+# skorlu CANDIDATE_POOL eşleşme yeniden sıralanır
+FULL_RANK_LIMIT = 5000
+CANDIDATE_POOL = 1000
+
+# Önek araması terms tablosundan tam terimlere açılır; çok varyantlı önekler FTS'e kalır
+MAX_PREFIX_TERMS = 32
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS channels (
+    id INTEGER PRIMARY KEY,
+    handle TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    url TEXT,
+    title TEXT,
+    description TEXT,
+    google_title TEXT,
+    google_snippet TEXT,
+    score INTEGER NOT NULL DEFAULT 0,
+    url_type TEXT,
+    discovered_at TEXT
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS channels_fts USING fts5(
+    handle, title, description, google_title, google_snippet,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
+CREATE TABLE IF NOT EXISTS terms (term TEXT PRIMARY KEY) WITHOUT ROWID;
+"""
+
+
+def _normalise(text: str) -> str:
+    # Alt çizgi ve harf/rakam geçişleri kelime ayırır: "yks_2024", "kpss2024" -> "kpss 2024"
+    folded = fold_turkish(text or "").replace("_", " ")
+    return re.sub(r"(?<=[^\W\d])(?=\d)|(?<=\d)(?=[^\W\d])", " ", folded)
+
+
+def _parse_score(value) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def open_index(path: str = DEFAULT_SEARCH_INDEX_PATH) -> sqlite3.Connection:
+    """Open (and create if needed) the search index database."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(_SCHEMA)
+    if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+        _rebuild_fts(conn)
+    return conn
+
+
+def _fts_rowid(channel_id: int, score: int) -> int:
+    return (min(max(score, 0), _MAX_SCORE_KEY) << _ID_BITS) | channel_id
+
+
+def _terms(normalised: Iterable[str]) -> Set[str]:
+    return {token for text in normalised for token in re.findall(r"\w+", text)}
+
+
+def _insert_fts(conn: sqlite3.Connection, channel_id: int, values: Dict[str, str]) -> None:
+    rowid = _fts_rowid(channel_id, int(values["score"] or 0))
+    normalised = [_normalise(values[name] or "") for name in TEXT_FIELDS]
+    terms = _terms(normalised)
+    conn.executemany("INSERT OR IGNORE INTO terms (term) VALUES (?)", ((t,) for t in terms))
+    conn.execute(
+        "INSERT INTO channels_fts (rowid, handle, title, description, google_title, google_snippet)"
+        " VALUES (?, ?, ?, ?, ?, ?)",
+        (rowid, *normalised),
+    )
+
+
+def _prune_terms(conn: sqlite3.Connection, terms: Iterable[str]) -> None:
+    """Drop terms that no longer match any FTS row (after a channel's text changed)."""
+    for term in terms:
+        if conn.execute(
+            "SELECT 1 FROM channels_fts WHERE channels_fts MATCH ? LIMIT 1", (f'"{term}"',)
+        ).fetchone() is None:
+            conn.execute("DELETE FROM terms WHERE term = ?", (term,))
+
+
+def _rebuild_fts(conn: sqlite3.Connection) -> None:
+    """Re-normalise every stored channel into a fresh FTS table."""
+    with conn:
+        conn.execute("DELETE FROM channels_fts")
+        conn.execute("DELETE FROM terms")
+        for row in conn.execute("SELECT * FROM channels").fetchall():
+            _insert_fts(conn, row["id"], dict(row))
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+def index_candidates(conn: sqlite3.Connection, rows: Iterable[Dict[str, str]]) -> int:
+    """Insert or update candidate rows; the latest discovery of a handle wins."""
+    count = 0
+    with conn:
+        for row in rows:
+            handle = (row.get("handle") or "").strip()
+            if not handle:
+                continue
+            values = {
+                "handle": handle,
+                "url": row.get("url") or f"https://t.me/{handle}",
+                "title": row.get("title") or "",
+                "description": row.get("description") or "",
+                "google_title": row.get("google_title") or "",
+                "google_snippet": row.get("google_snippet") or "",
+                "score": _parse_score(row.get("score")),
+                "url_type": row.get("url_type") or "",
+                "discovered_at": row.get("discovered_at") or "",
+            }
+            existing = conn.execute(
+                "SELECT * FROM channels WHERE handle = ?", (handle,)
+            ).fetchone()
+            stale: Set[str] = set()
+            if existing is not None:
+                conn.execute(
+                    "DELETE FROM channels_fts WHERE rowid = ?",
+                    (_fts_rowid(existing["id"], existing["score"]),),
+                )
+                stale = _terms(_normalise(existing[name] or "") for name in TEXT_FIELDS)
+            conn.execute(
+                """
+                INSERT INTO channels (handle, url, title, description, google_title,
+                                      google_snippet, score, url_type, discovered_at)
+                VALUES (:handle, :url, :title, :description, :google_title,
+                        :google_snippet, :score, :url_type, :discovered_at)
+                ON CONFLICT(handle) DO UPDATE SET
+                    url = excluded.url,
+                    title = excluded.title,
+                    description = excluded.description,
+                    google_title = excluded.google_title,
+                    google_snippet = excluded.google_snippet,
+                    score = excluded.score,
+                    url_type = excluded.url_type,
+                    discovered_at = excluded.discovered_at
+                """,
+                values,
+            )
+            channel_id = conn.execute(
+                "SELECT id FROM channels WHERE handle = ?", (handle,)
+            ).fetchone()[0]
+            _insert_fts(conn, channel_id, values)
+            # Kanalın metninden düşen terimler başka satırda yoksa önek açılımından çıkar
+            stale -= _terms(_normalise(values[name]) for name in TEXT_FIELDS)
+            _prune_terms(conn, stale)
+            count += 1
+    return count
+
+
+def _expand_prefix(conn: sqlite3.Connection, token: str) -> str:
+    """Expand a prefix term to an OR of indexed terms (cheaper than FTS5 prefix scans)."""
+    terms = [
+        row[0]
+        for row in conn.execute(
+            "SELECT term FROM terms WHERE term >= ? AND term < ? LIMIT ?",
+            (token, token + "\U0010ffff", MAX_PREFIX_TERMS + 1),
+        )
+    ]
+    if not terms:
+        return f'"{token}"'
+    if len(terms) > MAX_PREFIX_TERMS:
+        return f'"{token}"*'
+    if len(terms) == 1:
+        return f'"{terms[0]}"'
+    return "(" + " OR ".join(f'"{term}"' for term in terms) + ")"
+
+
+def build_match_query(query: str, conn: sqlite3.Connection | None = None) -> str:
+    """Turn free text into an FTS5 MATCH expression (AND of prefix terms)."""
+    tokens = re.findall(r"\w+", _normalise(query))
+    parts = []
+    for token in tokens:
+        # Ekler için önek araması: "kitap" -> kitaplar, kitaplık; yıllar tam eşleşir
+        if len(token) < 3 or token.isdigit():
+            parts.append(f'"{token}"')
+        elif conn is not None:
+            parts.append(_expand_prefix(conn, token))
+        else:
+            parts.append(f'"{token}"*')
+    return " AND ".join(parts)
+
+
+def search_channels(
+    conn: sqlite3.Connection,
+    query: str,
+    limit: int = 20,
+    min_score: int = 0,
+    score_weight: float = 1.0,
+) -> List[Dict[str, str]]:
+    """Search the index, ranking by BM25 combined with the stored channel score.
+
+    bm25() is negative (lower is better); the stored score is squashed into
+    [0, 1) and subtracted, so ``score_weight`` controls how far a high-scoring
+    channel can move up past a slightly better text match.
+
+    bm25 has to be computed per matching row, which is too slow for terms that
+    match most of the index. Up to FULL_RANK_LIMIT matches are ranked exactly;
+    beyond that only the CANDIDATE_POOL highest-scored matches (read in FTS
+    rowid order, which encodes the score) are re-ranked, so a strong text match
+    on a low-scored channel can be missed. ``score_weight=0`` asks for pure
+    text ranking and always ranks every match, at the full bm25 cost.
+    """
+    match = build_match_query(query, conn)
+    if not match:
+        return []
+
+    min_rowid = _fts_rowid(0, min_score)
+    pool = -1
+    if score_weight != 0:
+        matches = conn.execute(
+            "SELECT count(*) FROM (SELECT rowid FROM channels_fts"
+            " WHERE channels_fts MATCH ? AND rowid >= ? LIMIT ?)",
+            (match, min_rowid, FULL_RANK_LIMIT + 1),
+        ).fetchone()[0]
+        if matches > FULL_RANK_LIMIT:
+            pool = max(CANDIDATE_POOL, limit)
+
+    weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+    cursor = conn.execute(
+        f"""
+        SELECT c.handle, c.url, c.title, c.description, c.score, c.discovered_at,
+               f.text_rank
+        FROM (
+            SELECT rowid, bm25(channels_fts, {weights}) AS text_rank
+            FROM channels_fts
+            WHERE channels_fts MATCH ? AND rowid >= ?
+            ORDER BY rowid DESC
+            LIMIT ?
+        ) AS f
+        JOIN channels AS c ON c.id = (f.rowid & {_ID_MASK})
+        WHERE c.score >= ?
+        ORDER BY f.text_rank - ? * (c.score * 1.0 / (c.score + 10))
+        LIMIT ?
+        """,
+        (match, min_rowid, pool, min_score, score_weight, limit),
+    )
+    return [dict(row) for row in cursor.fetchall()]
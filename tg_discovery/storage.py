@@ -18,6 +18,11 @@ CANDIDATE_FIELDS = [
     "score",
     "url_type",
     "discovered_at",
+    "docs_pdf",
+    "docs_epub",
+    "docs_mobi",
+    "last_post_at",
+    "posts_per_day",
 ]
 
 
@@ -59,3 +64,13 @@ def save_candidates_to_csv(path: str, rows: List[Dict[str, str]]) -> None:
         for row in rows:
             cleaned = {field: row.get(field, "") for field in CANDIDATE_FIELDS}
             writer.writerow(cleaned)
+
+
+def load_candidates_from_csv(path: str) -> List[Dict[str, str]]:
+    """Load candidate rows from a CSV file written by save_candidates_to_csv."""
+    rows: List[Dict[str, str]] = []
+    with open(path, "r", newline="", encoding="utf-8") as handle:
+        reader = csv.DictReader(handle)
+        for row in reader:
+            rows.append({field: row.get(field, "") or "" for field in CANDIDATE_FIELDS})
+    return rows
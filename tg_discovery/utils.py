@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
+import unicodedata
 from urllib.parse import urlparse
 
 
@@ -50,3 +51,30 @@ def now_iso() -> str:
 def now_filename() -> str:
     """Return a timestamp suitable for file names."""
     return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+# Türkçe harfleri ASCII karşılıklarına katla (kütüphane -> kutuphane, ı/İ -> i)
+_TURKISH_FOLD = str.maketrans(
+    {
+        "ç": "c",
+        "ğ": "g",
+        "ı": "i",
+        "ö": "o",
+        "ş": "s",
+        "ü": "u",
+        "â": "a",
+        "î": "i",
+        "û": "u",
+    }
+)
+
+
+def fold_turkish(text: str) -> str:
+    """Lowercase with Turkish casing rules and fold diacritics to ASCII."""
+    if not text:
+        return ""
+    # str.lower() "İ" harfini "i̇" yapar, "I" ise Türkçede "ı" olmalı
+    lowered = text.replace("İ", "i").replace("I", "ı").lower()
+    folded = lowered.translate(_TURKISH_FOLD)
+    decomposed = unicodedata.normalize("NFKD", folded)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))